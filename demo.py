@@ -7,7 +7,12 @@
 # --- 1. Import Libraries ---
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import matplotlib
+matplotlib.use('Agg')  # non-interactive backend, charts are only written to JPEG files
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
@@ -16,91 +21,218 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Tabl
 from datetime import datetime
 import matplotlib.ticker as mticker
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-# --- 2. Load Data ---
-df = pd.read_csv("Amazon Sale Report.csv", encoding='unicode_escape')
-df.columns = df.columns.str.strip()  # remove spaces
-df.columns = df.columns.str.title()  # normalize case
+try:
+    import numexpr as ne
+except ImportError:  # fall back to a plain NumPy mask below
+    ne = None
+
+# --- 2. Read Header Only (or the cleaned Parquet cache from a previous run) ---
+csv_path = "Amazon Sale Report.csv"
+cache_path = "cache.parquet"
+# The cache is stale if either the CSV or this script (its load/clean logic) changed after it was written.
+use_cache = os.path.exists(cache_path) and os.path.getmtime(cache_path) > max(
+    os.path.getmtime(csv_path), os.path.getmtime(__file__)
+)
+if use_cache:
+    df = pd.read_parquet(cache_path, engine='pyarrow')
+    header = df.columns
+else:
+    raw_cols = pd.read_csv(csv_path, nrows=0, encoding='unicode_escape').columns
+    header = [c.strip().title() for c in raw_cols]  # remove spaces, normalize case
+    rename_map = dict(zip(raw_cols, header))
 
 # --- 3. Identify Key Columns Automatically ---
-amount_col = next((c for c in df.columns if 'amount' in c.lower()), None)
-date_col = next((c for c in df.columns if 'date' in c.lower()), None)
-category_col = next((c for c in df.columns if 'category' in c.lower()), None)
-fulfil_col = next((c for c in df.columns if 'fulfil' in c.lower()), None)
-state_col = next((c for c in df.columns if 'state' in c.lower()), None)
-
-# --- 4. Clean Data ---
-df = df.dropna(subset=[amount_col])
-df[amount_col] = pd.to_numeric(df[amount_col], errors='coerce')
-df = df.dropna(subset=[date_col])
-df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-df = df[df[amount_col] > 0]
-
-# --- 5. Key Metrics ---
-total_orders = len(df)
-total_revenue = df[amount_col].sum()
-avg_order_value = df[amount_col].mean()
-date_min, date_max = df[date_col].min(), df[date_col].max()
-
-# --- 6. Amazon Color Theme ---
+amount_col = next((c for c in header if 'amount' in c.lower()), None)
+date_col = next((c for c in header if 'date' in c.lower()), None)
+category_col = next((c for c in header if 'category' in c.lower()), None)
+fulfil_col = next((c for c in header if 'fulfil' in c.lower()), None)
+state_col = next((c for c in header if 'state' in c.lower()), None)
+
+if not use_cache:
+    # --- 4. Load Data (only the columns we use, typed during parse) ---
+    used_cols = [c for c in (amount_col, date_col, category_col, fulfil_col, state_col) if c]
+    raw_name = {v: k for k, v in rename_map.items()}
+
+    def read_used_columns(amount_type, date_type):
+        return pa_csv.read_csv(
+            csv_path,
+            read_options=pa_csv.ReadOptions(encoding='unicode_escape', block_size=32 << 20, use_threads=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=[raw_name[c] for c in used_cols],
+                column_types={
+                    raw_name[amount_col]: amount_type,
+                    raw_name[date_col]: date_type,
+                    # dictionary-encoded strings arrive in pandas as categoricals
+                    **{raw_name[c]: pa.dictionary(pa.int32(), pa.string()) for c in (category_col, fulfil_col, state_col) if c},
+                },
+                timestamp_parsers=[pa_csv.ISO8601, '%m-%d-%y', '%m/%d/%Y'],
+                # same NA strings as pd.read_csv, so blank/"NA" keys stay missing instead of becoming groups
+                strings_can_be_null=True,
+                null_values=['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                             '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'],
+            ),
+        ).to_pandas().rename(columns=rename_map)
+
+    try:
+        df = read_used_columns(pa.float64(), pa.timestamp('ns'))
+        has_date = df[date_col].notna().to_numpy()  # every non-empty date parsed, so NaT means an empty cell
+    except pa.ArrowInvalid:
+        # A cell the typed reader rejects (stray symbol, other date format): read Amount/Date
+        # as text and coerce bad cells to NaN/NaT so the clean step drops them, as before.
+        df = read_used_columns(pa.string(), pa.string())
+        has_date = df[date_col].notna().to_numpy()  # only empty cells are dropped; unparseable dates stay as NaT
+        df[amount_col] = pd.to_numeric(df[amount_col], errors='coerce')
+        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+
+    # --- 5. Clean Data ---
+    # Same rows as dropna(Amount) + dropna(Date) + "> 0" on the raw cells: NaN amounts fail "> 0",
+    # and rows whose date cell was present but unparseable are kept (as NaT) and still counted.
+    clean_vars = {'amount': df[amount_col].to_numpy(np.float64), 'has_date': has_date}
+    if ne is not None:
+        mask = ne.evaluate("(amount > 0) & has_date", local_dict=clean_vars)
+    else:
+        mask = (clean_vars['amount'] > 0) & clean_vars['has_date']
+    df = df.iloc[mask]
+    df[amount_col] = df[amount_col].astype(np.float32)  # halves bytes per scan; sums accumulate in float64
+    df.to_parquet(cache_path, engine='pyarrow', compression='zstd', index=False)
+
+# --- 6. Key Metrics & Revenue Aggregations (single fused pass) ---
+months = df[date_col].to_numpy().astype('datetime64[M]')  # C-level cast, no Period objects
+group_keys = {'Month': months}
+group_keys.update({c: df[c] for c in (category_col, fulfil_col, state_col) if c})
+factorized = {name: pd.factorize(key, sort=False) for name, key in group_keys.items()}
+sizes = np.array([len(uniques) for _, uniques in factorized.values()])
+offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+# The fused Numba kernel only pays for its import (~0.3 s) and first-run JIT compile (~6 s)
+# on very large files; below this row count the NumPy bincount path is faster end to end.
+NUMBA_MIN_ROWS = 20_000_000
+numba = None
+if len(df) >= NUMBA_MIN_ROWS:
+    try:
+        import numba
+    except ImportError:  # stay on the NumPy path below
+        pass
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def fused_aggregate(amount, dates, codes, offsets, n_bins, n_chunks):
+        # Each thread fills its own histogram row; rows are merged at the end.
+        n = amount.shape[0]
+        step = (n + n_chunks - 1) // n_chunks
+        bins = np.zeros((n_chunks, n_bins))
+        totals = np.zeros(n_chunks)
+        mins = np.full(n_chunks, np.int64(2**63 - 1))
+        maxs = np.full(n_chunks, np.int64(-2**63))
+        for t in numba.prange(n_chunks):
+            for i in range(t * step, min(n, (t + 1) * step)):
+                a = amount[i]
+                totals[t] += a
+                if dates[i] != np.int64(-2**63):  # skip NaT like pandas min/max
+                    mins[t] = min(mins[t], dates[i])
+                    maxs[t] = max(maxs[t], dates[i])
+                for k in range(codes.shape[1]):
+                    if codes[i, k] >= 0:
+                        bins[t, offsets[k] + codes[i, k]] += a
+        return bins.sum(axis=0), totals.sum(), mins.min(), maxs.max()
+
+    codes = np.column_stack([c for c, _ in factorized.values()]).astype(np.int32)
+    sums, total_revenue, date_min, date_max = fused_aggregate(
+        df[amount_col].to_numpy(), df[date_col].to_numpy('datetime64[ns]').view(np.int64),
+        codes, offsets, int(sizes.sum()), numba.get_num_threads(),
+    )
+    total_orders = len(df)
+    avg_order_value = total_revenue / total_orders
+    date_min, date_max = pd.Timestamp(date_min), pd.Timestamp(date_max)
+else:
+    total_orders = len(df)
+    total_revenue = float(df[amount_col].to_numpy().sum(dtype=np.float64))  # float64 accumulator, no copy
+    avg_order_value = total_revenue / total_orders
+    date_min, date_max = df[date_col].agg(['min', 'max'])
+    # Per-group sums straight from the integer codes, no pandas groupby objects.
+    amount = df[amount_col].to_numpy()
+    sums = np.concatenate([
+        np.bincount(codes[codes >= 0], weights=amount[codes >= 0], minlength=size)
+        for (codes, _), size in zip(factorized.values(), sizes)
+    ])
+revenue_by = {
+    name: pd.Series(sums[off:off + size], index=pd.Index(uniques, name=name), name=amount_col)
+    for (name, (_, uniques)), off, size in zip(factorized.items(), offsets, sizes)
+}
+
+# --- 7. Amazon Color Theme ---
 sns.set_style("whitegrid")
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+plt.rcParams['agg.path.chunksize'] = 10000
 amazon_orange = "#FF9900"
 amazon_gray = "#232F3E"
 amazon_black = "#0F1111"
 
 def save_chart(fig, name):
-    path = f"{name}.png"
-    fig.savefig(path, bbox_inches='tight', dpi=300)
-    plt.close(fig)
+    # JPEG is embedded in the PDF as-is (DCT passthrough), PNG would be decoded and recompressed.
+    path = f"{name}.jpg"
+    fig.savefig(path, format='jpg', bbox_inches='tight', dpi=150, pil_kwargs={'quality': 85})
     return path
 
-# --- 7. Charts ---
-
-# Monthly Revenue Trend
-df['Month'] = df[date_col].dt.to_period('M')
-monthly_revenue = df.groupby('Month')[amount_col].sum()
-fig, ax = plt.subplots(figsize=(7,4))
-monthly_revenue.plot(kind='bar', color=amazon_orange, ax=ax)
-ax.set_title("Monthly Revenue Trend", fontsize=12, color=amazon_black, weight='bold')
-ax.set_xlabel("Month")
-ax.set_ylabel("Revenue (₹)")
-ax.yaxis.set_major_formatter(mticker.StrMethodFormatter('{x:,.0f}'))
-plt.xticks(rotation=45)
-monthly_chart = save_chart(fig, "monthly_revenue")
-
-# Top 10 Product Categories
-if category_col:
-    top_cats = df.groupby(category_col)[amount_col].sum().sort_values(ascending=False).head(10)
-    fig, ax = plt.subplots(figsize=(6,4))
-    sns.barplot(x=top_cats.values, y=top_cats.index, ax=ax, palette=[amazon_orange]*10)
-    ax.set_title("Top 10 Product Categories", fontsize=12, color=amazon_black, weight='bold')
+# Render functions build standalone Figures (no pyplot state) so they can run concurrently.
+def render_monthly(monthly_revenue):
+    fig = Figure(figsize=(7,4))
+    ax = fig.subplots()
+    monthly_revenue.plot(kind='bar', color=amazon_orange, ax=ax)
+    ax.set_title("Monthly Revenue Trend", fontsize=12, color=amazon_black, weight='bold')
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Revenue (₹)")
+    ax.yaxis.set_major_formatter(mticker.StrMethodFormatter('{x:,.0f}'))
+    ax.tick_params(axis='x', labelrotation=45)
+    return save_chart(fig, "monthly_revenue")
+
+def render_top_bar(top, title, name):
+    labels, vals = top.index.astype(str).to_numpy(), top.to_numpy()
+    fig = Figure(figsize=(6,4))
+    ax = fig.subplots()
+    ax.barh(labels, vals, color=amazon_orange)
+    ax.invert_yaxis()  # largest bar on top
+    ax.set_ylabel(top.index.name)
+    ax.set_title(title, fontsize=12, color=amazon_black, weight='bold')
     ax.set_xlabel("Revenue (₹)")
-    topcat_chart = save_chart(fig, "top_categories")
-else:
-    topcat_chart = None
+    return save_chart(fig, name)
 
-# Fulfillment Method Analysis
-if fulfil_col:
-    fulfill = df.groupby(fulfil_col)[amount_col].sum()
-    fig, ax = plt.subplots(figsize=(5,5))
+def render_fulfillment(fulfill):
+    fig = Figure(figsize=(5,5))
+    ax = fig.subplots()
     ax.pie(fulfill, labels=fulfill.index, autopct='%1.1f%%', colors=[amazon_orange, amazon_gray, amazon_black])
     ax.set_title("Fulfillment Method Distribution", fontsize=12, weight='bold')
-    fulfill_chart = save_chart(fig, "fulfillment")
-else:
-    fulfill_chart = None
+    return save_chart(fig, "fulfillment")
+
+# --- 8. Charts (rendered in parallel) ---
+def top_n(revenue, n=10):
+    # O(K) partition to find the n largest groups, then sort only those n.
+    vals = revenue.to_numpy()
+    idx = np.argpartition(vals, -n)[-n:] if len(vals) > n else np.arange(len(vals))
+    return revenue.iloc[idx[np.argsort(-vals[idx], kind='stable')]]
 
-# Top States by Revenue
+monthly_revenue = revenue_by['Month'].sort_index()
+monthly_revenue.index = monthly_revenue.index.to_numpy().astype('datetime64[M]').astype(str)
+chart_jobs = {'monthly': (render_monthly, monthly_revenue)}
+if category_col:
+    top_cats = top_n(revenue_by[category_col])
+    chart_jobs['topcat'] = (render_top_bar, top_cats, "Top 10 Product Categories", "top_categories")
+if fulfil_col:
+    # Pie colours are positional, so keep slices in sorted label order like the original groupby did.
+    fulfill = revenue_by[fulfil_col]
+    chart_jobs['fulfill'] = (render_fulfillment, fulfill.set_axis(fulfill.index.astype(str)).sort_index())
 if state_col:
-    top_states = df.groupby(state_col)[amount_col].sum().sort_values(ascending=False).head(10)
-    fig, ax = plt.subplots(figsize=(6,4))
-    sns.barplot(x=top_states.values, y=top_states.index, ax=ax, palette=[amazon_orange]*10)
-    ax.set_title("Top 10 States by Revenue", fontsize=12, color=amazon_black, weight='bold')
-    ax.set_xlabel("Revenue (₹)")
-    topstates_chart = save_chart(fig, "top_states")
-else:
-    topstates_chart = None
+    top_states = top_n(revenue_by[state_col])
+    chart_jobs['topstates'] = (render_top_bar, top_states, "Top 10 States by Revenue", "top_states")
+
+# Charts render in the background while the text part of the PDF is assembled below.
+executor = ThreadPoolExecutor(max_workers=4)
+chart_futures = {name: executor.submit(fn, *args) for name, (fn, *args) in chart_jobs.items()}
 
-# --- 8. Generate Professional PDF Report ---
+# --- 9. Generate Professional PDF Report ---
 styles = getSampleStyleSheet()
 styles.add(ParagraphStyle(name='TitleStyle', fontSize=20, textColor=amazon_orange, spaceAfter=20, alignment=1, leading=24))
 styles.add(ParagraphStyle(name='Heading', fontSize=14, textColor=amazon_black, spaceAfter=10, leading=18))
@@ -171,6 +303,12 @@ def add_chart_to_pdf(image_path, caption):
         story.append(Spacer(1, 16))
 
 story.append(Paragraph("<b>Visual Analysis</b>", styles['Heading']))
+charts = {name: future.result() for name, future in chart_futures.items()}
+executor.shutdown()
+monthly_chart = charts['monthly']
+topcat_chart = charts.get('topcat')
+fulfill_chart = charts.get('fulfill')
+topstates_chart = charts.get('topstates')
 add_chart_to_pdf(monthly_chart, "Monthly revenue shows seasonal performance patterns.")
 add_chart_to_pdf(topcat_chart, "Top-performing product categories contributing to total revenue.")
 add_chart_to_pdf(fulfill_chart, "Fulfillment method distribution and its impact on delivery efficiency.")